@@ -1,71 +1,133 @@
 import tkinter as tk
 from tkinter import messagebox, ttk
-from datetime import datetime
+from itertools import groupby
 import re
 import sqlite3 # Importamos la librería para SQLite
+import sys
+import time
+
+# Expresiones regulares de validación (compiladas una sola vez)
+_RE_TITULAR = re.compile(r"^[A-Za-zÁÉÍÓÚñáéíóú]+( [A-Za-zÁÉÍÓÚñáéíóú]+)+$")
+_RE_TITULAR_PARTIAL = re.compile(r"[A-Za-zÁÉÍÓÚñáéíóú ]*")
+
+# Última fecha formateada: (segundo, texto). Se reutiliza mientras no cambie el segundo
+_ultima_fecha = (None, "")
+
+def _fecha_actual():
+    """Devuelve la fecha y hora actual como 'AAAA-MM-DD HH:MM:SS', formateándola como máximo una vez por segundo."""
+    global _ultima_fecha
+    segundo = int(time.time())
+    if segundo != _ultima_fecha[0]:
+        _ultima_fecha = (segundo, time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(segundo)))
+    return _ultima_fecha[1]
+
+# Cantidad de transacciones que se agregan al Treeview del historial en cada página
+FILAS_POR_PAGINA = 200
+
+def _es_monto_parcial(texto):
+    """Valida tecla a tecla un importe: solo dígitos, a lo sumo un punto y hasta 2 decimales."""
+    entero, _, decimales = texto.partition('.')
+    return (not entero or entero.isdecimal()) and len(decimales) <= 2 and (not decimales or decimales.isdecimal())
+
+def _a_centavos(texto):
+    """Convierte un importe en soles escrito como texto (p. ej. '10.50') a centavos enteros."""
+    return int(round(float(texto) * 100))
+
+def _formatear_soles(centavos):
+    """Convierte centavos no negativos en el texto 'S/. 10.50'."""
+    return f"S/. {centavos // 100}.{centavos % 100:02d}"
+
+def _formatear_monto(monto):
+    """Convierte un monto con signo (en centavos) en el texto que se muestra y guarda, p. ej. '+S/. 10.00'."""
+    return f"{'+' if monto >= 0 else '-'}{_formatear_soles(abs(monto))}"
 
 # Lógica de negocio con POO
 class Cuenta:
+    # Atributos fijos: sin __dict__ por instancia
+    __slots__ = ('numero', 'titular', '_saldo_cents', '_hist_fechas', '_hist_tipos', '_hist_montos')
+
     def __init__(self, numero, titular, saldo_inicial):
         self.numero = numero
         self.titular = titular
-        self._saldo = saldo_inicial  # Saldo encapsulado
-        self.historial = []  # Historial almacenado en memoria (lista de tuplas)
-        # Formato de historial: (fecha, tipo, monto)
+        self._saldo_cents = saldo_inicial  # Saldo encapsulado, en centavos enteros
+        # Historial en memoria como listas paralelas (fecha, tipo, monto con signo en centavos)
+        self._hist_fechas = []
+        self._hist_tipos = []
+        self._hist_montos = []
 
     def depositar(self, monto):
         if monto <= 0:
             raise ValueError("El monto a depositar debe ser un valor positivo. ¡Inténtalo de nuevo!")
-        self._saldo += monto
-        self._registrar_transaccion("Depósito", f"+S/. {monto:.2f}")
+        self._saldo_cents += monto
+        return self._registrar_transaccion("Depósito", monto)
 
     def retirar(self, monto):
         if monto <= 0:
             raise ValueError("El monto a retirar debe ser un valor positivo. ¡Verifica el valor ingresado!")
-        if monto > self._saldo:
-            raise ValueError(f"¡Saldo insuficiente! Tu saldo actual es S/. {self._saldo:.2f}. No puedes retirar S/. {monto:.2f}.")
-        self._saldo -= monto
-        self._registrar_transaccion("Retiro", f"-S/. {monto:.2f}")
+        if monto > self._saldo_cents:
+            raise ValueError(f"¡Saldo insuficiente! Tu saldo actual es {_formatear_soles(self._saldo_cents)}. No puedes retirar {_formatear_soles(monto)}.")
+        self._saldo_cents -= monto
+        return self._registrar_transaccion("Retiro", -monto)
 
     def transferir(self, destino, monto):
+        """Transfiere a otra cuenta. Devuelve las transacciones nuevas de (origen, destino)."""
         # Primero retira de la cuenta de origen (aprovecha la validación de retiro)
-        self.retirar(monto)
+        retiro = self.retirar(monto)
         # Luego deposita en la cuenta de destino (aprovecha la validación de depósito)
-        destino.depositar(monto)
-        self._registrar_transaccion(f"Transferencia a {destino.numero}", f"-S/. {monto:.2f}")
-        destino._registrar_transaccion(f"Transferencia de {self.numero}", f"+S/. {monto:.2f}")
-
-    def _registrar_transaccion(self, tipo, monto_str):
-        """Registra la transacción en el historial de la cuenta (en memoria)."""
-        fecha = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-        self.historial.append((fecha, tipo, monto_str))
-        # Aquí se necesita una forma de notificar a la base de datos
-        # Esto lo manejaremos desde BancaApp después de cada operación
+        deposito = destino.depositar(monto)
+        salida = self._registrar_transaccion(f"Transferencia a {destino.numero}", -monto)
+        entrada = destino._registrar_transaccion(f"Transferencia de {self.numero}", monto)
+        return [retiro, salida], [deposito, entrada]
+
+    def _registrar_transaccion(self, tipo, monto):
+        """Registra la transacción en el historial de la cuenta (en memoria) y la devuelve."""
+        fecha = _fecha_actual()
+        tipo = sys.intern(tipo)  # Los tipos se repiten mucho; se comparte una sola copia
+        self._hist_fechas.append(fecha)
+        self._hist_tipos.append(tipo)
+        self._hist_montos.append(monto)
+        # BancaApp guarda en la base de datos solo la transacción devuelta
+        return (fecha, tipo, monto)
+
+    def _cargar_historial(self, filas):
+        """Agrega al historial las filas (fecha, tipo, monto_str) leídas de la base de datos."""
+        for fecha, tipo, monto_str in filas:
+            self._hist_fechas.append(fecha)
+            self._hist_tipos.append(sys.intern(tipo))
+            self._hist_montos.append(_a_centavos(monto_str.replace("S/. ", "")))
+
+    def historial(self, inicio=0, fin=None):
+        """Devuelve el historial (o el tramo [inicio:fin]) como filas (fecha, tipo, monto) listas para mostrar."""
+        return [(fecha, tipo, _formatear_monto(monto))
+                for fecha, tipo, monto in zip(self._hist_fechas[inicio:fin], self._hist_tipos[inicio:fin], self._hist_montos[inicio:fin])]
+
+    def total_transacciones(self):
+        """Devuelve la cantidad de transacciones registradas en la cuenta."""
+        return len(self._hist_fechas)
 
     def aplicar_interes(self):
-        """Método polimórfico para aplicar interés, a ser implementado por subclases."""
-        pass
+        """Aplica el interés mensual según la TASA_MENSUAL definida por cada subclase (redondeado al centavo)."""
+        interes_ganado = round(self._saldo_cents * self.TASA_MENSUAL)
+        self._saldo_cents += interes_ganado
+        return self._registrar_transaccion(f"Interés ({self.TIPO})", interes_ganado)
 
     def saldo(self):
-        """Devuelve el saldo actual de la cuenta."""
-        return self._saldo
+        """Devuelve el saldo actual de la cuenta en centavos."""
+        return self._saldo_cents
 
 class CuentaAhorro(Cuenta):
-    def aplicar_interes(self):
-        tasa_anual = 0.01  # 1% anual
-        tasa_mensual = tasa_anual / 12
-        interes_ganado = self._saldo * tasa_mensual
-        self._saldo += interes_ganado
-        self._registrar_transaccion("Interés (Ahorro)", f"+S/. {interes_ganado:.2f}")
+    __slots__ = ()
+    TIPO = "Ahorro"
+    TASA_MENSUAL = 0.01 / 12  # 1% anual
 
 class CuentaCorriente(Cuenta):
-    def aplicar_interes(self):
-        tasa_anual = 0.0005  # 0.05% anual
-        tasa_mensual = tasa_anual / 12
-        interes_ganado = self._saldo * tasa_mensual
-        self._saldo += interes_ganado
-        self._registrar_transaccion("Interés (Corriente)", f"+S/. {interes_ganado:.2f}")
+    __slots__ = ()
+    TIPO = "Corriente"
+    TASA_MENSUAL = 0.0005 / 12  # 0.05% anual
+
 
+# Clase de cuenta correspondiente a cada tipo guardado en la base de datos
+_CUENTA_TYPES = {cls.TIPO: cls for cls in (CuentaAhorro, CuentaCorriente)}
 
 # Diccionario global para almacenar los objetos de cuenta en memoria
 cuentas = {}
@@ -89,8 +151,23 @@ class BancaApp:
 
         # Comandos de validación
         self.vcmd_numero = master.register(lambda P: P.isdigit() and len(P) <= 10 or P == "")
-        self.vcmd_titular = master.register(lambda P: re.fullmatch(r"[A-Za-zÁÉÍÓÚñáéíóú ]*", P) is not None)
-        self.vcmd_saldo = master.register(lambda P: re.fullmatch(r'\d*\.?\d{0,2}', P) is not None)
+        # Tk necesita un booleano, por eso se compara el resultado con None
+        self.vcmd_titular = master.register(lambda P: _RE_TITULAR_PARTIAL.fullmatch(P) is not None)
+        self.vcmd_saldo = master.register(_es_monto_parcial)
+
+        # Último (numero, saldo) mostrado en la etiqueta de saldo y actualización pendiente al teclear
+        self._last_saldo_key = (None, None)
+        self._saldo_after_id = None
+        # Frame visible en este momento (lo asigna create_widgets y luego show_frame)
+        self._current_frame = None
+
+        # Función que ejecuta cada tipo de operación del menú "Selecciona la Operación"
+        self._op_handlers = {
+            "Depósito": self._op_deposito,
+            "Retiro": self._op_retiro,
+            "Transferencia": self._op_transferencia,
+            "Aplicar Interés": self._op_interes,
+        }
 
         self.create_widgets()
     
@@ -99,13 +176,20 @@ class BancaApp:
         try:
             self.db_conn = sqlite3.connect('banco.db')
             cursor = self.db_conn.cursor()
+
+            # Modo WAL con synchronous=NORMAL: evita un fsync completo en cada commit
+            cursor.execute("PRAGMA journal_mode=WAL")
+            cursor.execute("PRAGMA synchronous=NORMAL")
+            cursor.execute("PRAGMA temp_store=MEMORY")
+            cursor.execute("PRAGMA cache_size=-20000")  # ~20 MB de caché de páginas
+            cursor.execute("PRAGMA foreign_keys=ON")
             
             # Tabla de cuentas
             cursor.execute('''
                 CREATE TABLE IF NOT EXISTS cuentas (
                     numero TEXT PRIMARY KEY,
                     titular TEXT NOT NULL,
-                    saldo REAL NOT NULL,
+                    saldo INTEGER NOT NULL,
                     tipo TEXT NOT NULL
                 )
             ''')
@@ -121,8 +205,17 @@ class BancaApp:
                     FOREIGN KEY (numero_cuenta) REFERENCES cuentas(numero)
                 )
             ''')
+            # Índice para leer el historial agrupado por cuenta sin ordenar toda la tabla
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_hist_cuenta ON historial(numero_cuenta)")
+
+            # Las bases anteriores (user_version 0) guardaban el saldo en soles; se pasa a centavos una sola vez
+            cursor.execute("PRAGMA user_version")
+            if cursor.fetchone()[0] < 1:
+                cursor.execute("UPDATE cuentas SET saldo = CAST(ROUND(saldo * 100) AS INTEGER)")
+                cursor.execute("PRAGMA user_version = 1")
             
             self.db_conn.commit()
+            cursor.close()
         except sqlite3.Error as e:
             messagebox.showerror("Error de Base de Datos", f"No se pudo conectar o inicializar la base de datos: {e}")
             self.master.destroy() # Cierra la aplicación si hay un problema con la DB
@@ -131,70 +224,56 @@ class BancaApp:
         """Carga las cuentas y sus historiales desde la base de datos al diccionario global."""
         if not self.db_conn: return # No intentar si la conexión falló
 
-        cursor = self.db_conn.cursor()
-        cursor.execute("SELECT numero, titular, saldo, tipo FROM cuentas")
-        
-        for row in cursor.fetchall():
-            numero, titular, saldo, tipo = row
-            if tipo == "Ahorro":
-                cuenta = CuentaAhorro(numero, titular, saldo)
-            elif tipo == "Corriente":
-                cuenta = CuentaCorriente(numero, titular, saldo)
-            cuentas[numero] = cuenta
+        with self.db_conn as conn:
+            for numero, titular, saldo, tipo in conn.execute("SELECT numero, titular, saldo, tipo FROM cuentas"):
+                # int(): en bases migradas la columna conserva afinidad REAL
+                cuentas[numero] = _CUENTA_TYPES[tipo](numero, titular, int(saldo))
             
-            # Cargar historial para cada cuenta
-            hist_cursor = self.db_conn.cursor()
-            hist_cursor.execute("SELECT fecha, tipo_transaccion, monto_str FROM historial WHERE numero_cuenta = ?", (numero,))
-            for h_row in hist_cursor.fetchall():
-                cuenta.historial.append(h_row) # Asumiendo que el formato de tupla es el mismo
-
-    def update_account_in_db(self, cuenta):
-        """Actualiza el saldo y el historial de una cuenta en la base de datos."""
+            # Cargar el historial de todas las cuentas con una sola consulta, agrupado por cuenta
+            hist_cursor = conn.execute("SELECT numero_cuenta, fecha, tipo_transaccion, monto_str FROM historial ORDER BY numero_cuenta, id")
+            for numero, filas in groupby(hist_cursor, key=lambda h_row: h_row[0]):
+                if numero in cuentas:
+                    cuentas[numero]._cargar_historial(h_row[1:] for h_row in filas)
+            hist_cursor.close()
+
+    def update_accounts_in_db(self, *cambios):
+        """Guarda el saldo y las nuevas transacciones de cada par (cuenta, transacciones) recibido."""
         if not self.db_conn: return
 
-        cursor = self.db_conn.cursor()
-        
-        # Actualizar saldo
-        cursor.execute("UPDATE cuentas SET saldo = ? WHERE numero = ?", (cuenta.saldo(), cuenta.numero))
-        
-        # Insertar nuevas transacciones en el historial (solo las que aún no están en la DB)
-        # Esto requiere un seguimiento de qué transacciones ya se guardaron o vaciar y reinsertar
-        # Para simplificar en este ejemplo, reinsertaremos el historial completo para la cuenta
-        # En una aplicación real, usarías un ID único para cada transacción y solo insertarías nuevas
-        
-        cursor.execute("DELETE FROM historial WHERE numero_cuenta = ?", (cuenta.numero,))
-        for fecha, tipo, monto_str in cuenta.historial:
-            cursor.execute("INSERT INTO historial (numero_cuenta, fecha, tipo_transaccion, monto_str) VALUES (?, ?, ?, ?)",
-                           (cuenta.numero, fecha, tipo, monto_str))
-        
-        self.db_conn.commit()
+        # Todas las cuentas se guardan en una sola transacción de SQLite (se confirma o se revierte completa)
+        with self.db_conn as conn:
+            for cuenta, transacciones in cambios:
+                # Actualizar saldo
+                conn.execute("UPDATE cuentas SET saldo = ? WHERE numero = ?", (cuenta.saldo(), cuenta.numero))
+
+                # Solo se insertan las transacciones nuevas; las anteriores ya están en la DB
+                conn.executemany("INSERT INTO historial (numero_cuenta, fecha, tipo_transaccion, monto_str) VALUES (?, ?, ?, ?)",
+                                 [(cuenta.numero, fecha, tipo, _formatear_monto(monto)) for fecha, tipo, monto in transacciones])
 
     def add_new_account_to_db(self, cuenta):
         """Inserta una nueva cuenta en la base de datos."""
         if not self.db_conn: return
 
-        cursor = self.db_conn.cursor()
-        cursor.execute("INSERT INTO cuentas (numero, titular, saldo, tipo) VALUES (?, ?, ?, ?)",
-                       (cuenta.numero, cuenta.titular, cuenta.saldo(), "Ahorro" if isinstance(cuenta, CuentaAhorro) else "Corriente"))
-        self.db_conn.commit()
+        with self.db_conn as conn:
+            conn.execute("INSERT INTO cuentas (numero, titular, saldo, tipo) VALUES (?, ?, ?, ?)",
+                         (cuenta.numero, cuenta.titular, cuenta.saldo(), cuenta.TIPO))
 
     def limpiar_entradas(self, *entradas):
         for e in entradas:
             e.delete(0, tk.END)
 
     def show_frame(self, frame_to_show):
-        self.main_frame.pack_forget()
-        self.create_account_frame.pack_forget()
-        self.operations_frame.pack_forget()
-        self.history_frame.pack_forget()
+        # Solo hace falta ocultar el frame que está visible
+        if self._current_frame is not None:
+            self._current_frame.pack_forget()
         
         frame_to_show.pack(fill="both", expand=True, padx=20, pady=20)
+        self._current_frame = frame_to_show
         if frame_to_show == self.operations_frame:
             self.reset_operation_fields()
         if frame_to_show == self.history_frame:
             self.limpiar_entradas(self.entry_historial)
-            for row in self.tree_historial.get_children():
-                self.tree_historial.delete(row)
+            self._limpiar_historial()
 
     def create_widgets(self):
         self.main_frame = tk.Frame(self.master, bg="#e6f2ff", padx=20, pady=20)
@@ -214,6 +293,7 @@ class BancaApp:
                   bg="#673AB7", fg="white", activebackground="#5e35b1", padx=20, pady=10, bd=0, relief="raised").pack(pady=10, fill="x")
 
         self.main_frame.pack(fill="both", expand=True)
+        self._current_frame = self.main_frame
 
         self.create_account_frame = tk.LabelFrame(self.master, text=" Abrir Nueva Cuenta ", font=self.fuente_titulo, bg="#f0faff", fg="#333333", padx=15, pady=10)
         self.operations_frame = tk.LabelFrame(self.master, text=" Realizar Operación ", font=self.fuente_titulo, bg="#f0faff", fg="#333333", padx=15, pady=10)
@@ -255,7 +335,7 @@ class BancaApp:
         tk.Label(self.operations_frame, text="Número de Cuenta", bg="#f0faff", font=self.fuente_normal).pack(pady=(5, 2))
         self.entry_numero_op = tk.Entry(self.operations_frame, font=self.fuente_normal, validate="key", validatecommand=(self.vcmd_numero, '%P'), width=35)
         self.entry_numero_op.pack(pady=(0, 5))
-        self.entry_numero_op.bind("<KeyRelease>", self.actualizar_saldo_op)
+        self.entry_numero_op.bind("<KeyRelease>", self._programar_actualizar_saldo)
         self.entry_numero_op.bind("<FocusOut>", self.actualizar_saldo_op)
 
         self.label_saldo_op = tk.Label(self.operations_frame, text="Saldo actual: ---", bg="#f0faff", font=("Helvetica Neue", 10, "bold"), fg="#333333")
@@ -291,6 +371,13 @@ class BancaApp:
         self.tree_historial.column("Tipo", width=150, anchor="center")
         self.tree_historial.column("Monto", width=100, anchor="center")
         self.tree_historial.pack(expand=True, fill="both", padx=5, pady=5)
+
+        # Solo se muestran las últimas transacciones; "Ver más" agrega las anteriores por páginas
+        self.historial_cuenta = None
+        self.historial_inicio = 0
+        self.btn_ver_mas = tk.Button(self.history_frame, text="Ver más", font=self.fuente_normal, command=self._ver_mas_historial,
+                                     bg="#9575CD", fg="white", activebackground="#7e57c2", padx=10, pady=2, bd=0, relief="raised", state="disabled")
+        self.btn_ver_mas.pack(pady=(0, 5))
         
         tk.Button(self.history_frame, text="Volver al Inicio", font=self.fuente_normal, command=lambda: self.show_frame(self.main_frame),
                   bg="#ff6666", fg="white", activebackground="#e05252", padx=10, pady=5, bd=0, relief="raised").pack(pady=5)
@@ -324,6 +411,7 @@ class BancaApp:
         self.op_type_var.set("Depósito")
         self.limpiar_entradas(self.entry_numero_op, self.entry_monto_op, self.entry_destino_op)
         self.label_saldo_op.config(text="Saldo actual: ---")
+        self._last_saldo_key = (None, None)
         self.update_operation_fields()
 
     def _crear_cuenta(self):
@@ -340,18 +428,18 @@ class BancaApp:
             if not saldo_str:
                 raise ValueError("Por favor, ingresa el (saldo inicial).")
             
-            saldo = float(saldo_str)
+            saldo = _a_centavos(saldo_str)
 
-            if not re.match(r"^\d{10}$", numero):
+            if not (len(numero) == 10 and numero.isdecimal()):
                 raise ValueError("El número de cuenta debe tener exactamente (10 dígitos numéricos).")
-            if not re.match(r"^[A-Za-zÁÉÍÓÚñáéíóú]+( [A-Za-zÁÉÍÓÚñáéíóú]+)+$", titular):
+            if not _RE_TITULAR.match(titular):
                 raise ValueError("Por favor, ingresa un (nombre y al menos un apellido válidos).")
             if saldo < 0:
                 raise ValueError("El saldo inicial no puede ser negativo.")
             if numero in cuentas:
                 raise ValueError("¡Ups! Esta cuenta ya existe. Por favor, verifica el número.")
 
-            cuenta = CuentaAhorro(numero, titular, saldo) if tipo == "Ahorro" else CuentaCorriente(numero, titular, saldo)
+            cuenta = _CUENTA_TYPES[tipo](numero, titular, saldo)
             cuentas[numero] = cuenta
             
             # ¡NUEVO! Guardar la nueva cuenta en la base de datos
@@ -377,39 +465,7 @@ class BancaApp:
                 raise ValueError("La cuenta no fue encontrada.")
 
             cuenta_origen = cuentas[numero]
-
-            if tipo_operacion == "Depósito":
-                if not monto_str: raise ValueError("Ingresa el monto a depositar.")
-                monto = float(monto_str)
-                cuenta_origen.depositar(monto)
-                # ¡NUEVO! Actualizar la cuenta en la base de datos
-                self.update_account_in_db(cuenta_origen)
-                messagebox.showinfo("Depósito Exitoso", f"¡Depósito realizado! Saldo actual: S/. {cuenta_origen.saldo():.2f}")
-            elif tipo_operacion == "Retiro":
-                if not monto_str: raise ValueError("Ingresa el monto a retirar.")
-                monto = float(monto_str)
-                cuenta_origen.retirar(monto)
-                # ¡NUEVO! Actualizar la cuenta en la base de datos
-                self.update_account_in_db(cuenta_origen)
-                messagebox.showinfo("Retiro Exitoso", f"¡Retiro realizado! Saldo restante: S/. {cuenta_origen.saldo():.2f}")
-            elif tipo_operacion == "Transferencia":
-                if not destino: raise ValueError("Ingresa la cuenta de destino.")
-                if not monto_str: raise ValueError("Ingresa el monto a transferir.")
-                monto = float(monto_str)
-                if destino not in cuentas: raise ValueError("La cuenta de destino no fue encontrada.")
-                if numero == destino: raise ValueError("No puedes transferir dinero a la misma cuenta.")
-                
-                cuenta_destino = cuentas[destino]
-                cuenta_origen.transferir(cuenta_destino, monto)
-                # ¡NUEVO! Actualizar ambas cuentas en la base de datos
-                self.update_account_in_db(cuenta_origen)
-                self.update_account_in_db(cuenta_destino)
-                messagebox.showinfo("Transferencia Exitosa", f"¡Transferencia realizada con éxito!\nSaldo origen: S/. {cuenta_origen.saldo():.2f}")
-            elif tipo_operacion == "Aplicar Interés":
-                cuenta_origen.aplicar_interes()
-                # ¡NUEVO! Actualizar la cuenta en la base de datos
-                self.update_account_in_db(cuenta_origen)
-                messagebox.showinfo("Interés Aplicado", f"Interés aplicado correctamente.\nNuevo saldo: S/. {cuenta_origen.saldo():.2f}")
+            self._op_handlers[tipo_operacion](cuenta_origen, monto_str, destino)
             
             self.limpiar_entradas(self.entry_numero_op, self.entry_monto_op, self.entry_destino_op)
             self.actualizar_saldo_op()
@@ -419,10 +475,51 @@ class BancaApp:
         except Exception as e:
             messagebox.showerror("Error Inesperado", f"Ocurrió un error inesperado: {e}.")
 
+    def _op_deposito(self, cuenta_origen, monto_str, destino):
+        if not monto_str: raise ValueError("Ingresa el monto a depositar.")
+        monto = _a_centavos(monto_str)
+        transaccion = cuenta_origen.depositar(monto)
+        # ¡NUEVO! Actualizar la cuenta en la base de datos
+        self.update_accounts_in_db((cuenta_origen, [transaccion]))
+        messagebox.showinfo("Depósito Exitoso", f"¡Depósito realizado! Saldo actual: {_formatear_soles(cuenta_origen.saldo())}")
+
+    def _op_retiro(self, cuenta_origen, monto_str, destino):
+        if not monto_str: raise ValueError("Ingresa el monto a retirar.")
+        monto = _a_centavos(monto_str)
+        transaccion = cuenta_origen.retirar(monto)
+        # ¡NUEVO! Actualizar la cuenta en la base de datos
+        self.update_accounts_in_db((cuenta_origen, [transaccion]))
+        messagebox.showinfo("Retiro Exitoso", f"¡Retiro realizado! Saldo restante: {_formatear_soles(cuenta_origen.saldo())}")
+
+    def _op_transferencia(self, cuenta_origen, monto_str, destino):
+        if not destino: raise ValueError("Ingresa la cuenta de destino.")
+        if not monto_str: raise ValueError("Ingresa el monto a transferir.")
+        monto = _a_centavos(monto_str)
+        if destino not in cuentas: raise ValueError("La cuenta de destino no fue encontrada.")
+        if cuenta_origen.numero == destino: raise ValueError("No puedes transferir dinero a la misma cuenta.")
+        
+        cuenta_destino = cuentas[destino]
+        trans_origen, trans_destino = cuenta_origen.transferir(cuenta_destino, monto)
+        # ¡NUEVO! Actualizar ambas cuentas en la base de datos
+        self.update_accounts_in_db((cuenta_origen, trans_origen), (cuenta_destino, trans_destino))
+        messagebox.showinfo("Transferencia Exitosa", f"¡Transferencia realizada con éxito!\nSaldo origen: {_formatear_soles(cuenta_origen.saldo())}")
+
+    def _op_interes(self, cuenta_origen, monto_str, destino):
+        transaccion = cuenta_origen.aplicar_interes()
+        # ¡NUEVO! Actualizar la cuenta en la base de datos
+        self.update_accounts_in_db((cuenta_origen, [transaccion]))
+        messagebox.showinfo("Interés Aplicado", f"Interés aplicado correctamente.\nNuevo saldo: {_formatear_soles(cuenta_origen.saldo())}")
+
+    def _limpiar_historial(self):
+        # Una sola llamada a Tcl borra todas las filas
+        self.tree_historial.delete(*self.tree_historial.get_children())
+        self.historial_cuenta = None
+        self.historial_inicio = 0
+        self.btn_ver_mas.config(state="disabled")
+
     def _ver_historial(self):
         numero = self.entry_historial.get().strip()
-        for row in self.tree_historial.get_children():
-            self.tree_historial.delete(row)
+        self._limpiar_historial()
         
         if not numero:
             messagebox.showerror("Error", "Por favor, ingresa el número de cuenta para ver su historial.")
@@ -432,20 +529,46 @@ class BancaApp:
             messagebox.showerror("Error", "El número de cuenta no fue encontrado.")
             return
 
-        transacciones = cuentas[numero].historial
+        cuenta = cuentas[numero]
         
-        if not transacciones:
+        if not cuenta.total_transacciones():
             messagebox.showinfo("Historial Vacío", "No se encontraron transacciones para esta cuenta.")
         else:
-            for fila in transacciones:
-                self.tree_historial.insert('', 'end', values=fila)
+            self.historial_cuenta = cuenta
+            self.historial_inicio = cuenta.total_transacciones()
+            self._ver_mas_historial()
+
+    def _ver_mas_historial(self):
+        """Agrega al inicio del Treeview la siguiente página de transacciones más antiguas."""
+        if self.historial_cuenta is None: return
+
+        fin = self.historial_inicio
+        inicio = max(0, fin - FILAS_POR_PAGINA)
+        for fila in reversed(self.historial_cuenta.historial(inicio, fin)):
+            self.tree_historial.insert('', 0, values=fila)
+        self.historial_inicio = inicio
+        self.btn_ver_mas.config(state="normal" if inicio > 0 else "disabled")
+
+    def _programar_actualizar_saldo(self, event=None):
+        # Agrupa las teclas seguidas en una sola actualización del saldo
+        if self._saldo_after_id is not None:
+            self.master.after_cancel(self._saldo_after_id)
+        self._saldo_after_id = self.master.after(150, self.actualizar_saldo_op)
 
     def actualizar_saldo_op(self, event=None):
+        # Si se llama directamente (FocusOut, tras una operación), descarta la actualización pendiente
+        if self._saldo_after_id is not None:
+            self.master.after_cancel(self._saldo_after_id)
+            self._saldo_after_id = None
         numero = self.entry_numero_op.get().strip()
-        if numero in cuentas:
-            self.label_saldo_op.config(text=f"Saldo actual: S/. {cuentas[numero].saldo():.2f}")
+        key = (numero, cuentas[numero].saldo()) if numero in cuentas else (None, None)
+        if key == self._last_saldo_key:
+            return  # La etiqueta ya muestra este saldo
+        if key[0] is not None:
+            self.label_saldo_op.config(text=f"Saldo actual: {_formatear_soles(key[1])}")
         else:
             self.label_saldo_op.config(text="Saldo actual: ---")
+        self._last_saldo_key = key
 
 # Iniciar la aplicación
 root = tk.Tk()